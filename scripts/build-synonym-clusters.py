@@ -9,22 +9,40 @@ Approach:
 4. Cluster by shared base + form
 5. Output clusters with canonical (highest frequency) and aliases
 
+Ingredient frequencies are cached in data/.cache/ and reused until
+RAW_recipes.csv (or this script) changes; pass --no-cache to re-read the
+CSV and rewrite the cache.
+
 Usage:
     python scripts/build-synonym-clusters.py
     python scripts/build-synonym-clusters.py --min-freq 10
+    python scripts/build-synonym-clusters.py --no-cache
+    python scripts/build-synonym-clusters.py --jobs 4
 """
 
 import csv
 import json
 import re
 import ast
-from collections import Counter, defaultdict
+import functools
+import os
+import pickle
+import sys
+from collections import Counter, defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, groupby
+from operator import attrgetter
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib encoder
+    orjson = None
+
 # ---------------------------------------------------------------------------
 # Form modifiers - differentiate variants of the same base ingredient
 # ---------------------------------------------------------------------------
-FORM_MODIFIERS = {
+FORM_MODIFIERS = frozenset({
     # Processing state
     "powder", "powdered", "ground", "granulated", "granules", "flakes", "flaked",
     "minced", "chopped", "diced", "sliced", "shredded", "grated", "crushed",
@@ -40,7 +58,7 @@ FORM_MODIFIERS = {
     # Quality
     "organic", "natural", "pure", "real", "imitation", "low-fat", "nonfat",
     "unsalted", "salted", "sweetened", "unsweetened",
-}
+})
 
 # Lemma mappings
 LEMMAS = {
@@ -80,65 +98,134 @@ LEMMAS = {
 }
 
 # Unit words that indicate measurement, not identity
-UNIT_WORDS = {
+UNIT_WORDS = frozenset({
     "clove", "cloves", "head", "heads", "bulb", "bulbs", "stalk", "stalks",
     "leaf", "leaves", "sprig", "sprigs", "bunch", "bunches", "rib", "ribs",
     "ear", "ears", "strip", "strips", "piece", "pieces", "slice", "slices",
     "cup", "cups", "tablespoon", "tablespoons", "teaspoon", "teaspoons",
     "pound", "pounds", "ounce", "ounces", "can", "cans", "package", "packages",
-}
+})
+
+# Runs of 2+ word characters; anything else separates tokens
+_TOKEN_RE = re.compile(r"[a-z0-9-]{2,}")
+
+# One kept ingredient; a tuple, so no per-record __dict__
+Member = namedtuple("Member", "key name count")
 
 def tokenize(text: str) -> list[str]:
     """Tokenize text into lowercase words."""
-    return [t for t in re.sub(r"[^a-z0-9\s-]", " ", text.lower()).split() if len(t) >= 2]
+    return _TOKEN_RE.findall(text.lower())
 
-def lemmatize(word: str) -> str:
-    """Normalize word forms."""
-    return LEMMAS.get(word, word)
+@functools.lru_cache(maxsize=None)
+def extract_base_and_form(ingredient: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Split ingredient into base tokens and form modifier tokens.
 
-def extract_base_and_form(ingredient: str) -> tuple[list[str], list[str]]:
-    """Split ingredient into base tokens and form modifier tokens."""
-    tokens = tokenize(ingredient)
+    Cached, so results are returned as tuples and must not be mutated.
+    """
     base = []
     form = []
 
-    for t in tokens:
-        lemma = lemmatize(t)
+    for t in tokenize(ingredient):
+        lemma = LEMMAS.get(t, t)
         if t in FORM_MODIFIERS or lemma in FORM_MODIFIERS:
             form.append(lemma)
         elif t not in UNIT_WORDS:
             base.append(t)
 
-    return base, form
-
-def make_cluster_key(base: list[str], form: list[str]) -> str:
-    """Create a unique key for clustering."""
-    base_key = "+".join(sorted(base)) if base else "_empty_"
-    form_key = "+".join(sorted(form)) if form else "base"
-    return f"{base_key}|{form_key}"
-
-def load_ingredients(csv_path: str) -> Counter:
-    """Load ingredient frequencies from RAW_recipes.csv."""
-    freq = Counter()
-    with open(csv_path, "r") as f:
+    return tuple(base), tuple(form)
+
+def split_all(ingredients: list[str], jobs: int = 1) -> list[tuple[tuple[str, ...], tuple[str, ...]]]:
+    """Run extract_base_and_form over ingredients in `jobs` worker processes.
+
+    jobs=1 runs serially in this process, which is faster for corpus-sized
+    inputs (~10k names) than paying the pool's startup and pickling cost.
+    """
+    if jobs == 1:
+        return [extract_base_and_form(ing) for ing in ingredients]
+    # One chunk per worker: the per-item work is tiny, so fewer round trips win
+    chunksize = max(1, len(ingredients) // jobs)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(extract_base_and_form, ingredients, chunksize=chunksize))
+
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be >= 1 (ValueError becomes a usage error)."""
+    n = int(value)
+    if n < 1:
+        raise ValueError(value)
+    return n
+
+def make_cluster_key(base: tuple[str, ...], form: tuple[str, ...]) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Create a unique key for clustering: order-insensitive (base, form)."""
+    return tuple(sorted(base)), tuple(sorted(form))
+
+def iter_ingredient_lists(csv_path: Path):
+    """Yield the parsed ingredients list of each recipe in RAW_recipes.csv."""
+    with open(csv_path, "r", newline="") as f:
         reader = csv.reader(f)
-        next(reader)  # skip header
+        header = next(reader)
+        col = header.index("ingredients")
         for row in reader:
-            if len(row) >= 11:
-                try:
-                    ingredients = ast.literal_eval(row[10])  # ingredients column
-                    for ing in ingredients:
-                        norm = ing.lower().strip()
-                        if len(norm) > 1:
-                            freq[norm] += 1
-                except:
-                    pass
+            if len(row) <= col:
+                continue
+            try:
+                ingredients = ast.literal_eval(row[col])
+            except (ValueError, SyntaxError):
+                continue
+            # Skip malformed rows (e.g. ['salt', 2]) so callers can rely on str items
+            if isinstance(ingredients, list) and all(isinstance(ing, str) for ing in ingredients):
+                yield ingredients
+
+def write_json(path: Path, data) -> None:
+    """Write data as 2-space indented UTF-8 JSON (orjson when available)."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+
+def load_ingredients(csv_path: Path) -> Counter:
+    """Load ingredient frequencies from RAW_recipes.csv."""
+    # Normalize and count in C (map + Counter.update), then drop the
+    # handful of empty/single-character names instead of testing each one
+    ingredients = chain.from_iterable(iter_ingredient_lists(csv_path))
+    freq = Counter(map(str.strip, map(str.lower, ingredients)))
+    for name in [name for name in freq if len(name) <= 1]:
+        del freq[name]
     return freq
 
+def cached(cache_path: Path, producer, deps: list[Path], refresh: bool = False):
+    """Return producer()'s result, pickled at cache_path until any of deps is newer.
+
+    An unreadable cache (truncated, corrupt) counts as a miss; refresh=True
+    always reruns producer() and rewrites the cache.
+    """
+    if not refresh and cache_path.exists():
+        cache_mtime = cache_path.stat().st_mtime
+        if all(dep.stat().st_mtime < cache_mtime for dep in deps):
+            try:
+                with cache_path.open("rb") as f:
+                    return pickle.load(f)
+            except (EOFError, pickle.UnpicklingError, OSError) as e:
+                print(f"  Ignoring unreadable cache {cache_path}: {e}")
+
+    value = producer()
+    # Write to a temp file and rename, so an interrupted run never leaves a
+    # truncated cache that looks newer than its deps
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return value
+
 def main():
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument("--min-freq", type=int, default=5)
+    parser.add_argument("--no-cache", action="store_true", help="Re-read RAW_recipes.csv and rewrite the cache")
+    parser.add_argument("--jobs", type=positive_int, default=1, help="Worker processes for tokenizing (default: 1, in-process)")
     args = parser.parse_args()
 
     print("=== Build Synonym Clusters ===\n")
@@ -146,34 +233,43 @@ def main():
 
     # Load ingredients
     print("\nLoading ingredients...")
-    freq = load_ingredients("data/RAW_recipes.csv")
+    csv_path = Path("data/RAW_recipes.csv")
+    freq = cached(
+        Path("data/.cache/ingredient-freq.pickle"),
+        lambda: load_ingredients(csv_path),
+        deps=[csv_path, Path(__file__)],
+        refresh=args.no_cache,
+    )
+    # Intern names: they are reused as cache keys and cluster members
+    freq = Counter({sys.intern(name): count for name, count in freq.items()})
     print(f"  Total unique: {len(freq)}")
 
     # Filter and cluster
     print("\nClustering...")
-    clusters = defaultdict(list)  # key -> list of (ingredient, count, base, form)
+    # Member records; base/form are recomputed for the canonical only, since
+    # no other member's are used in the output (a cache hit when --jobs 1,
+    # one extra call per cluster when tokenizing ran in worker processes)
+    records = []
 
-    filtered_low = 0
+    frequent = [(ing, count) for ing, count in freq.items() if count >= args.min_freq]
+    filtered_low = len(freq) - len(frequent)
     kept = 0
 
-    for ing, count in freq.items():
-        if count < args.min_freq:
-            filtered_low += 1
-            continue
-
-        base, form = extract_base_and_form(ing)
+    splits = split_all([ing for ing, _ in frequent], args.jobs)
+    for (ing, count), (base, form) in zip(frequent, splits):
         if not base:  # No base tokens (all modifiers/units)
             continue
 
         key = make_cluster_key(base, form)
-        clusters[key].append({
-            "name": ing,
-            "count": count,
-            "base": base,
-            "form": form,
-        })
+        records.append(Member(key, ing, count))
         kept += 1
 
+    # Group with a single sort: by key, then count descending (stable, so
+    # ties keep corpus order). Each run of equal keys is one cluster with
+    # its canonical first.
+    records.sort(key=lambda m: (m.key, -m.count))
+    clusters = [list(members) for _, members in groupby(records, key=attrgetter("key"))]
+
     print(f"  Low frequency filtered: {filtered_low}")
     print(f"  Kept: {kept}")
     print(f"  Clusters: {len(clusters)}")
@@ -181,32 +277,34 @@ def main():
     # Build output clusters
     output_clusters = []
 
-    for key, members in clusters.items():
-        # Sort by count descending
-        members.sort(key=lambda x: -x["count"])
+    for members in clusters:
         canonical = members[0]
 
         # Only include clusters with multiple members OR high-frequency singles
-        if len(members) == 1 and canonical["count"] < 50:
+        if len(members) == 1 and canonical.count < 50:
             continue
 
-        cluster = {
-            "canonical": canonical["name"],
-            "count": canonical["count"],
-            "base": canonical["base"],
-            "form": "+".join(canonical["form"]) if canonical["form"] else "base",
-            "aliases": [
-                {"name": m["name"], "count": m["count"]}
-                for m in members[1:] if m["count"] >= 5
-            ],
-            "totalUsage": sum(m["count"] for m in members),
-        }
+        aliases = [
+            {"name": m.name, "count": m.count}
+            for m in members[1:] if m.count >= 5
+        ]
+        # Aliases under the count threshold don't make it a multi-member cluster
+        if not aliases and canonical.count < 50:
+            continue
 
-        if cluster["aliases"] or canonical["count"] >= 50:
-            output_clusters.append(cluster)
+        base, form = extract_base_and_form(canonical.name)
+        output_clusters.append({
+            "canonical": canonical.name,
+            "count": canonical.count,
+            "base": base,
+            "form": "+".join(form) if form else "base",
+            "aliases": aliases,
+            "totalUsage": sum(m.count for m in members),
+        })
 
-    # Sort by total usage
-    output_clusters.sort(key=lambda x: -x["totalUsage"])
+    # Sort by total usage; ties break on the (unique) canonical name so the
+    # written order doesn't depend on cluster-key representation or CSV order
+    output_clusters.sort(key=lambda c: (-c["totalUsage"], c["canonical"]))
 
     print(f"\nOutput clusters: {len(output_clusters)}")
     print(f"  With aliases: {sum(1 for c in output_clusters if c['aliases'])}")
@@ -214,8 +312,7 @@ def main():
     # Group by base ingredient for analysis
     base_groups = defaultdict(list)
     for cluster in output_clusters:
-        base_key = "+".join(sorted(cluster["base"]))
-        base_groups[base_key].append(cluster)
+        base_groups[tuple(sorted(cluster["base"]))].append(cluster)
 
     print(f"  Unique base ingredients: {len(base_groups)}")
 
@@ -232,7 +329,7 @@ def main():
     }
 
     out_path = Path("data/synonym-clusters.json")
-    out_path.write_text(json.dumps(output, indent=2))
+    write_json(out_path, output)
     print(f"\nWritten to {out_path}")
 
     # Show examples
@@ -13,13 +13,38 @@ Usage:
     python scripts/expand-ontology-from-clusters.py --min-count 100
 """
 
+import heapq
 import json
 import re
+import string
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
 from collections import defaultdict
 
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib json module
+    orjson = None
+
 ROOT = Path(__file__).resolve().parent.parent
 
+_SLUG_CHARS = frozenset(string.ascii_lowercase + string.digits + "-")
+
+class _SlugTable(dict):
+    """str.translate table for slugify: keeps a-z, 0-9, "-" and whitespace.
+
+    Filled lazily per code point, so it covers all of Unicode.
+    """
+    def __missing__(self, codepoint: int):
+        ch = chr(codepoint)
+        keep = ch in _SLUG_CHARS or ch.isspace()
+        self[codepoint] = ch if keep else None
+        return self[codepoint]
+
+_SLUG_TABLE = _SlugTable()
+_TOKEN_RE = re.compile(r"[a-z0-9]{2,}")
+
 # Lemmas for normalization (same as in ontology cleanup)
 LEMMAS = {
     "powdered": "powder", "granulated": "granule", "flaked": "flake",
@@ -50,19 +75,29 @@ def normalize_surface(text: str) -> str:
     return " ".join(text.lower().strip().split())
 
 def slugify(text: str) -> str:
-    s = text.lower().strip()
-    s = re.sub(r"[^a-z0-9\s-]", "", s)
-    s = re.sub(r"[\s]+", "-", s)
-    return s.strip("-")
+    return "-".join(text.lower().translate(_SLUG_TABLE).split()).strip("-")
 
 def tokenize(text: str) -> set:
     """Extract tokens for matching."""
-    return {lemmatize(t) for t in re.sub(r"[^a-z0-9\s]", " ", text.lower()).split() if len(t) >= 2}
+    return {lemmatize(t) for t in _TOKEN_RE.findall(text.lower())}
+
+def read_json(path: Path):
+    """Load a JSON file (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text(encoding="utf-8"))
+
+def write_json(path: Path, data) -> None:
+    """Write data as 2-space indented UTF-8 JSON (orjson when available)."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
 
 def load_fdc_foods():
     """Load FDC foods from the staging data for matching."""
     # Use the synonym-gaps which has FDC candidates
-    gaps = json.loads((ROOT / "data" / "synonym-gaps.json").read_text())
+    gaps = read_json(ROOT / "data" / "synonym-gaps.json")
 
     # Build a map of ingredient -> best FDC candidate
     fdc_candidates = {}
@@ -87,19 +122,16 @@ def main():
 
     # Load current ontology
     ontology_path = ROOT / "data" / "ingredient-ontology-v2.json"
-    ontology = json.loads(ontology_path.read_text())
+    ontology = read_json(ontology_path)
     print(f"Current ontology: {len(ontology)} entries")
 
     # Build existing slug/surface form index
     existing_slugs = {e["slug"] for e in ontology}
-    existing_surfaces = set()
-    for e in ontology:
-        for sf in e.get("surfaceForms", []):
-            existing_surfaces.add(sf.lower())
+    existing_surfaces = {sf.lower() for e in ontology for sf in e.get("surfaceForms", ())}
 
     # Load unmatched clusters
     clusters_path = ROOT / "data" / "unmatched-clusters.json"
-    clusters_data = json.loads(clusters_path.read_text())
+    clusters_data = read_json(clusters_path)
     clusters = clusters_data["clusters"]
     print(f"Unmatched clusters: {len(clusters)}")
 
@@ -133,21 +165,18 @@ def main():
             skipped_existing += 1
             continue
 
-        # Try to find FDC match
-        fdc_match = fdc_candidates.get(canonical_lower)
+        # Lowercase each alias once; shared by FDC lookup and surface forms
+        aliases_lower = [alias.lower() for alias in aliases]
 
-        # If no direct match, try aliases
-        if not fdc_match:
-            for alias in aliases:
-                fdc_match = fdc_candidates.get(alias.lower())
-                if fdc_match:
-                    break
+        # Try to find FDC match: canonical first, then aliases in order
+        lookup_forms = chain((canonical_lower,), aliases_lower)
+        fdc_match = next(filter(None, map(fdc_candidates.get, lookup_forms)), None)
 
         # Build surface forms
-        surface_forms = [normalize_surface(canonical)]
-        seen = {surface_forms[0]}
-        for alias in aliases:
-            norm_alias = normalize_surface(alias)
+        surface_forms = [norm_canonical]
+        seen = {norm_canonical}
+        for alias_lower in aliases_lower:
+            norm_alias = " ".join(alias_lower.split())  # normalize_surface, minus the lower()
             if norm_alias not in seen and norm_alias not in existing_surfaces:
                 surface_forms.append(norm_alias)
                 seen.add(norm_alias)
@@ -187,8 +216,7 @@ def main():
 
     # Show samples
     print("\n=== SAMPLE NEW ENTRIES (top 20 by recipe count) ===")
-    new_entries.sort(key=lambda x: -x["recipeCount"])
-    for entry in new_entries[:20]:
+    for entry in heapq.nlargest(20, new_entries, key=itemgetter("recipeCount")):
         fdc_info = ""
         if entry.get("fdcCandidate"):
             fdc = entry["fdcCandidate"]
@@ -205,8 +233,7 @@ def main():
         ontology.sort(key=lambda e: e["slug"])
 
         # Write
-        content = json.dumps(ontology, indent=2, ensure_ascii=False)
-        ontology_path.write_text(content)
+        write_json(ontology_path, ontology)
         print(f"\nWritten {len(ontology)} entries to {ontology_path}")
         print(f"  New entries added: {len(new_entries)}")
         print(f"  Total surface forms: {sum(len(e.get('surfaceForms', [])) for e in ontology)}")
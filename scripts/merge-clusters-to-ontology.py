@@ -29,62 +29,130 @@ Usage:
 
 import json
 import re
+import string
+from operator import itemgetter
 from pathlib import Path
 from collections import defaultdict
 
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib json module
+    orjson = None
+
 ROOT = Path(__file__).resolve().parent.parent
 
+_SLUG_CHARS = frozenset(string.ascii_lowercase + string.digits)
+
+class _SlugTable(dict):
+    """str.translate table for slugify: keeps a-z, 0-9 and whitespace, turns
+    "-" into a space (so runs of either collapse to one hyphen), drops the rest.
+
+    Filled lazily per code point, so it covers all of Unicode.
+    """
+    def __missing__(self, codepoint: int):
+        ch = chr(codepoint)
+        if ch == "-":
+            self[codepoint] = " "
+        else:
+            keep = ch in _SLUG_CHARS or ch.isspace()
+            self[codepoint] = ch if keep else None
+        return self[codepoint]
+
+_SLUG_TABLE = _SlugTable()
+_TOKEN_RE = re.compile(r"[a-z0-9]{2,}")
+
+SYNONYM_TABLE_DECL = "export const SYNONYM_TABLE = new Map<string, string[][]>("
+_TS_TRAILING_COMMA = re.compile(r",(\s*\])")
+
 def slugify(text: str) -> str:
     """Convert text to slug."""
-    s = text.lower().strip()
-    s = re.sub(r"[^a-z0-9\s-]", "", s)
-    s = re.sub(r"[\s]+", "-", s)
-    s = re.sub(r"-+", "-", s)
-    return s.strip("-")
+    return "-".join(text.lower().translate(_SLUG_TABLE).split())
 
 def tokenize(text: str) -> list[str]:
     """Tokenize text into words."""
-    return [t for t in re.sub(r"[^a-z0-9\s]", " ", text.lower()).split() if len(t) >= 2]
+    return _TOKEN_RE.findall(text.lower())
+
+def iter_entries(text: str, start: int = 0):
+    """Yield the source of each top-level entry of the array literal at text[start:].
+
+    Single linear scan tracking bracket depth; brackets inside string
+    literals and // comments are ignored, and comments are cut out of the
+    yielded entries. Stops at the array's closing bracket.
+    """
+    depth = 0
+    entry_start = None
+    entry_parts = []
+    in_string = None
+    i = start
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if in_string:
+            if c == "\\":
+                i += 1
+            elif c == in_string:
+                in_string = None
+        elif c == '"' or c == "'":
+            in_string = c
+        elif c == "/" and text.startswith("//", i):
+            if depth >= 2:
+                entry_parts.append(text[entry_start:i])
+            i = text.find("\n", i)
+            if i == -1:
+                return
+            entry_start = i
+        elif c == "[":
+            depth += 1
+            if depth == 2:
+                entry_start = i
+        elif c == "]":
+            depth -= 1
+            if depth == 1:
+                entry_parts.append(text[entry_start:i + 1])
+                yield "".join(entry_parts)
+                entry_parts = []
+            elif depth == 0:
+                return
+        i += 1
 
 def extract_synonym_table(scorer_path: Path) -> dict[str, list[list[str]]]:
     """Extract SYNONYM_TABLE from lexical-scorer.ts."""
     content = scorer_path.read_text()
 
     # Find the SYNONYM_TABLE map
-    match = re.search(
-        r'export const SYNONYM_TABLE = new Map<string, string\[\]\[\]>\(\[\s*(.*?)\s*\]\);',
-        content,
-        re.DOTALL
-    )
-    if not match:
+    decl = content.find(SYNONYM_TABLE_DECL)
+    if decl == -1:
         print("Warning: Could not find SYNONYM_TABLE in lexical-scorer.ts")
         return {}
 
-    table_content = match.group(1)
-
-    # Parse entries: ["key", [["token1", "token2"], ["token3"]]]
+    # Each entry is ["key", [["token1", "token2"], ["token3"]]] - valid JSON
+    # once TS trailing commas are removed. Fail loudly rather than silently
+    # dropping synonyms from the merged ontology.
     synonyms = {}
-    # Match pattern: ["ingredient name", [[...], [...]]]
-    entry_pattern = re.compile(
-        r'\["([^"]+)",\s*\[((?:\[[^\]]*\](?:,\s*)?)+)\]\]',
-        re.DOTALL
-    )
-
-    for m in entry_pattern.finditer(table_content):
-        key = m.group(1)
-        tokens_str = m.group(2)
-        # Parse the token arrays
-        token_arrays = []
-        for arr_match in re.finditer(r'\[([^\]]*)\]', tokens_str):
-            arr_content = arr_match.group(1)
-            tokens = [t.strip().strip('"').strip("'") for t in arr_content.split(",") if t.strip()]
-            if tokens:
-                token_arrays.append(tokens)
+    for entry in iter_entries(content, decl + len(SYNONYM_TABLE_DECL)):
+        try:
+            key, token_arrays = json.loads(_TS_TRAILING_COMMA.sub(r"\1", entry))
+        except ValueError as e:
+            raise ValueError(f"Could not parse SYNONYM_TABLE entry in {scorer_path}: {entry}") from e
+        token_arrays = [tokens for tokens in token_arrays if tokens]
         if token_arrays:
             synonyms[key] = token_arrays
 
     return synonyms
 
+def read_json(path: Path):
+    """Load a JSON file (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text(encoding="utf-8"))
+
+def write_json(path: Path, data) -> None:
+    """Write data as 2-space indented UTF-8 JSON (orjson when available)."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+
 def main():
     import argparse
     parser = argparse.ArgumentParser()
@@ -95,19 +163,18 @@ def main():
 
     # Load existing ontology
     ontology_path = ROOT / "data" / "ingredient-ontology.json"
-    ontology = json.loads(ontology_path.read_text())
+    ontology = read_json(ontology_path)
     print(f"Existing ontology: {len(ontology)} entries")
 
-    # Build slug index
+    # Build slug index. Lookups are exact-match over a few thousand short
+    # surface forms, so a plain dict beats a trie here; values are the
+    # entries' own slug strings, so the index only adds the lowercased keys.
     slug_to_entry = {e["slug"]: e for e in ontology}
-    surface_to_slug = {}
-    for e in ontology:
-        for sf in e.get("surfaceForms", []):
-            surface_to_slug[sf.lower()] = e["slug"]
+    surface_to_slug = {sf.lower(): e["slug"] for e in ontology for sf in e.get("surfaceForms", ())}
 
     # Load synonym clusters
     clusters_path = ROOT / "data" / "synonym-clusters.json"
-    clusters_data = json.loads(clusters_path.read_text())
+    clusters_data = read_json(clusters_path)
     clusters = clusters_data["clusters"]
     print(f"Synonym clusters: {len(clusters)}")
 
@@ -131,12 +198,13 @@ def main():
 
     for cluster in clusters:
         canonical = cluster["canonical"]
-        canonical_lower = canonical.lower()
         aliases = cluster.get("aliases", [])
         total_count = cluster["totalUsage"]
 
-        # Collect all surface forms from this cluster
+        # Collect all surface forms from this cluster, lowercased once
         all_forms = [canonical] + [a["name"] for a in aliases]
+        all_forms_lc = [form.lower() for form in all_forms]
+        canonical_lower = all_forms_lc[0]
 
         # Try to find matching ontology entry
         matched_slug = None
@@ -151,8 +219,7 @@ def main():
                 matched_slug = cluster_slug
             else:
                 # 3. Try matching any alias
-                for alias in aliases:
-                    alias_lower = alias["name"].lower()
+                for alias_lower in all_forms_lc[1:]:
                     if alias_lower in surface_to_slug:
                         matched_slug = surface_to_slug[alias_lower]
                         break
@@ -163,10 +230,10 @@ def main():
 
             # Add new surface forms
             existing_forms = {sf.lower() for sf in entry.get("surfaceForms", [])}
-            for form in all_forms:
-                if form.lower() not in existing_forms:
+            for form, form_lower in zip(all_forms, all_forms_lc):
+                if form_lower not in existing_forms:
                     entry.setdefault("surfaceForms", []).append(form)
-                    existing_forms.add(form.lower())
+                    existing_forms.add(form_lower)
                     stats["surface_forms_added"] += 1
 
             # Add recipe count
@@ -182,8 +249,7 @@ def main():
                     stats["confirm_tokens_added"] += 1
 
             # Update surface_to_slug for new forms
-            for form in all_forms:
-                surface_to_slug[form.lower()] = matched_slug
+            surface_to_slug.update(dict.fromkeys(all_forms_lc, matched_slug))
         else:
             stats["clusters_unmatched"] += 1
             unmatched_clusters.append({
@@ -214,15 +280,17 @@ def main():
 
     # Show sample of unmatched (potential new entries)
     print(f"\n=== TOP 30 UNMATCHED CLUSTERS (potential new entries) ===")
-    unmatched_clusters.sort(key=lambda x: -x["count"])
+    unmatched_clusters.sort(key=itemgetter("count"), reverse=True)  # also the written order
     for c in unmatched_clusters[:30]:
         alias_str = f" + {c['aliases'][:3]}" if c["aliases"] else ""
         print(f"  [{c['count']:6}] {c['canonical']}{alias_str}")
 
-    # Count entries with new fields
-    with_confirm = sum(1 for e in ontology if "confirmTokens" in e)
-    with_recipe_count = sum(1 for e in ontology if "recipeCount" in e)
-    total_surface_forms = sum(len(e.get("surfaceForms", [])) for e in ontology)
+    # Count entries with new fields (one pass over the ontology)
+    with_confirm = with_recipe_count = total_surface_forms = 0
+    for e in ontology:
+        with_confirm += "confirmTokens" in e
+        with_recipe_count += "recipeCount" in e
+        total_surface_forms += len(e.get("surfaceForms", ()))
 
     print(f"\n=== FINAL ONTOLOGY STATS ===")
     print(f"Total entries: {len(ontology)}")
@@ -235,17 +303,17 @@ def main():
     else:
         # Write updated ontology
         out_path = ROOT / "data" / "ingredient-ontology-v2.json"
-        out_path.write_text(json.dumps(ontology, indent=2, ensure_ascii=False))
+        write_json(out_path, ontology)
         print(f"\nWritten to {out_path}")
 
         # Write unmatched clusters for review
         unmatched_path = ROOT / "data" / "unmatched-clusters.json"
-        unmatched_path.write_text(json.dumps({
+        write_json(unmatched_path, {
             "generated": "2026-02-05",
             "description": "Clusters from recipe corpus with no ontology match - candidates for new entries",
             "total": len(unmatched_clusters),
             "clusters": unmatched_clusters,
-        }, indent=2))
+        })
         print(f"Written unmatched to {unmatched_path}")
 
 if __name__ == "__main__":